@@ -0,0 +1,126 @@
+# Бенчмарк времени импорта пакета structural.
+#
+# Каждый сценарий запускается в отдельном интерпретаторе с -X importtime. Для сценария суммируется
+# кумулятивное время импорта модулей structural верхнего уровня вложенности, из нескольких запусков берётся минимум.
+#
+# Бюджеты заданы в долях базовой линии - времени импортов при запуске пустого интерпретатора (python -c pass),
+# измеренного в том же прогоне, поэтому они не зависят от скорости машины. Модули, которые загружает уже
+# пустой интерпретатор (например, из sitecustomize или .pth-файлов), не считаются нарушением запретов.
+#
+# Загрузка запрещённого модуля - ошибка (код возврата 1). Превышение бюджета по умолчанию - предупреждение,
+# с --strict-budget - тоже ошибка.
+#
+# Запуск из корня репозитория:
+#     python -m benchmarks.bench_import --output import.json
+#     python -m benchmarks.bench_import --strict-budget
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Сценарий: (код, который выполняет интерпретатор; бюджет в долях базовой линии; запрещённые модули).
+SCENARIOS: Dict[str, Tuple[str, float, Tuple[str, ...]]] = {
+    "package": (
+        "import structural", 0.5,
+        ("xmltodict", "typing", "inspect", "structural.adapter", "structural.instrumentation", "structural.proxy"),
+    ),
+    "target": ("from structural import Target", 2.5, ("xmltodict", "json", "typing", "inspect")),
+    "adapter": ("from structural import Adapter", 2.5, ("xmltodict", "json", "typing", "inspect")),
+    "proxy": ("from structural import Proxy", 4.5, ("xmltodict", "inspect", "structural.adapter")),
+    "all_patterns": ("from structural import *", 9.0, ("xmltodict",)),
+}
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def run_scenario(code: str) -> Tuple[int, int, List[str]]:
+    """
+    Возвращает кумулятивное время импорта модулей structural и всех модулей верхнего уровня (в микросекундах),
+    а также список всех загруженных модулей.
+    """
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    structural_us = 0
+    total_us = 0
+    modules = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        _, cumulative, indent, module = match.groups()
+        modules.append(module)
+        if indent:
+            continue
+        total_us += int(cumulative)
+        if module == "structural" or module.startswith("structural."):
+            structural_us += int(cumulative)
+    return structural_us, total_us, modules
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check the import time budget of the structural package.")
+    parser.add_argument("--repeat", type=int, default=5, help="interpreter runs per scenario")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="multiply every scenario budget by this factor")
+    parser.add_argument("--strict-budget", action="store_true", help="fail instead of warning when over budget")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options = parse_args(argv)
+    baseline_runs = [run_scenario("pass") for _ in range(options.repeat)]
+    baseline_us = min(total_us for _, total_us, _ in baseline_runs)
+    baseline_modules = set(baseline_runs[0][2])
+
+    results = {}
+    passed = True
+    for name, (code, budget_ratio, forbidden) in SCENARIOS.items():
+        budget_us = int(baseline_us * budget_ratio * options.budget_scale)
+        runs = [run_scenario(code) for _ in range(options.repeat)]
+        best_us = min(structural_us for structural_us, _, _ in runs)
+        loaded = set(runs[0][2])
+        unexpected = sorted(module for module in forbidden if module in loaded and module not in baseline_modules)
+        over_budget = best_us > budget_us
+        if over_budget:
+            print(f"warning: {name} imports in {best_us} us, budget is {budget_us} us", file=sys.stderr)
+        scenario_passed = not unexpected and not (over_budget and options.strict_budget)
+        passed = passed and scenario_passed
+        results[name] = {
+            "code": code,
+            "budget_ratio": budget_ratio,
+            "budget_us": budget_us,
+            "import_us": {"min": best_us, "max": max(structural_us for structural_us, _, _ in runs)},
+            "over_budget": over_budget,
+            "structural_modules": sorted(module for module in loaded if module.startswith("structural")),
+            "unexpected_modules": unexpected,
+            "passed": scenario_passed,
+        }
+    report = {
+        "python": sys.version.split()[0],
+        "baseline_us": baseline_us,
+        "budget_scale": options.budget_scale,
+        "strict_budget": options.strict_budget,
+        "passed": passed,
+        "results": results,
+    }
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+# Бенчмарк накладных расходов инструментирования.
+#
+# Сравнивает обычный метод с методом, помеченным instrumented, при выключенном и включённом инструментировании.
+# Завершается с кодом 1, если выключенное инструментирование дороже заданного бюджета.
+#
+# Запуск из корня репозитория:
+#     python -m benchmarks.bench_instrumentation --output instrumentation.json
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+from benchmarks.bench_structural import measure_latency
+from structural.decorator import BasicReporterDecorator, BasicSessionDataReporter, DataReporter
+from structural.instrumentation import HistogramExporter, TraceRecorder, instrumentation, instrumented
+
+
+class PlainComponent:
+
+    def call(self) -> None:
+        return None
+
+
+class InstrumentedComponent:
+
+    @instrumented
+    def call(self) -> None:
+        return None
+
+
+def latency(func, options: argparse.Namespace) -> float:
+    return measure_latency(func, options.repeat, options.min_time)["latency_ns"]["min"]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure the overhead of structural instrumentation hooks.")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per case")
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimal duration of one repeat, seconds")
+    parser.add_argument("--max-disabled-overhead-ns", type=float, default=150.0,
+                        help="fail if a disabled hook adds more than this per call")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options = parse_args(argv)
+    plain, hooked = PlainComponent(), InstrumentedComponent()
+    reporter: DataReporter = BasicSessionDataReporter()
+    for _ in range(16):
+        reporter = BasicReporterDecorator(reporter)
+
+    results: Dict[str, Dict] = {}
+    baseline = latency(plain.call, options)
+    disabled = latency(hooked.call, options)
+    reporter_disabled = latency(reporter.report_data, options)
+    with instrumentation(HistogramExporter()):
+        histogram = latency(hooked.call, options)
+        reporter_histogram = latency(reporter.report_data, options)
+    with instrumentation(TraceRecorder(max_traces=100)):
+        trace = latency(hooked.call, options)
+
+    results["method"] = {
+        "plain_ns": baseline,
+        "disabled_ns": disabled,
+        "histogram_ns": histogram,
+        "trace_ns": trace,
+        "disabled_overhead_ns": disabled - baseline,
+    }
+    results["decorator_depth_16"] = {
+        "disabled_ns": reporter_disabled,
+        "histogram_ns": reporter_histogram,
+    }
+    passed = results["method"]["disabled_overhead_ns"] <= options.max_disabled_overhead_ns
+    report = {
+        "budget_ns": options.max_disabled_overhead_ns,
+        "passed": passed,
+        "results": results,
+    }
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
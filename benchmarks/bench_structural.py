@@ -0,0 +1,296 @@
+# Бенчмарк накладных расходов структурных паттернов.
+#
+# Для каждого паттерна измеряется вызов через обёртку ("wrapped") и прямой вызов обёрнутого объекта ("direct")
+# на нескольких масштабах: размер данных, размер и глубина дерева, глубина декораторов, число легковесов.
+# Для каждого варианта считаются задержка одного вызова, пропускная способность и память (tracemalloc).
+#
+# Запуск из корня репозитория:
+#     python -m benchmarks.bench_structural --output bench.json
+#     python -m benchmarks.bench_structural --pattern proxy --pattern decorator
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from structural.adapter import Adaptee, Adapter
+from structural.bridge import AbstractAPI, CloudAPIImplementation, ExternalAPIImplementation
+from structural.composite import Loader, LoadCluster, LoadNode
+from structural.decorator import BasicReporterDecorator, BasicSessionDataReporter, DataReporter
+from structural.facade import AWSFacade, DbSubsystem, IoTSubsystem
+from structural.flyweight import Flyweight, FlyweightFactory
+from structural.proxy import AccessLogWriter, Proxy, RealSubject
+
+
+@contextlib.contextmanager
+def silenced() -> Iterator[None]:
+    """
+    Многие примеры печатают в stdout - на время замеров вывод уходит в /dev/null.
+    """
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def measure_latency(func: Callable[[], object], repeat: int, min_time: float) -> Dict:
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        total = timer.timeit(number)
+        if total >= min_time / 10:
+            break
+        number *= 10
+    number = max(1, int(number * min_time / total))
+    per_call_ns = [total / number * 1e9 for total in timer.repeat(repeat=repeat, number=number)]
+    best = min(per_call_ns)
+    return {
+        "calls_per_repeat": number,
+        "latency_ns": {
+            "min": best,
+            "median": statistics.median(per_call_ns),
+            "max": max(per_call_ns),
+        },
+        "throughput_per_s": 1e9 / best if best else None,
+    }
+
+
+def measure_memory(func: Callable[[], object], calls: int) -> Dict:
+    """
+    Результаты вызовов удерживаются до конца замера, чтобы учитывалась и память, которую они занимают
+    (именно в этом выигрывает Легковес).
+    """
+
+    tracemalloc.start()
+    try:
+        results = [func() for _ in range(calls)]
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return {
+        "calls": calls,
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "peak_bytes_per_call": peak / calls,
+    }
+
+
+def measure(func: Callable[[], object], repeat: int, min_time: float, memory_calls: int) -> Dict:
+    with silenced():
+        result = measure_latency(func, repeat, min_time)
+        result["memory"] = measure_memory(func, memory_calls)
+    return result
+
+
+def compare(
+        pattern: str,
+        scale: Dict,
+        direct: Callable[[], object],
+        wrapped: Callable[[], object],
+        options: argparse.Namespace
+) -> Dict:
+    direct_result = measure(direct, options.repeat, options.min_time, options.memory_calls)
+    wrapped_result = measure(wrapped, options.repeat, options.min_time, options.memory_calls)
+    direct_ns = direct_result["latency_ns"]["min"]
+    wrapped_ns = wrapped_result["latency_ns"]["min"]
+    return {
+        "pattern": pattern,
+        "scale": scale,
+        "direct": direct_result,
+        "wrapped": wrapped_result,
+        "overhead_ns": wrapped_ns - direct_ns,
+        "overhead_ratio": wrapped_ns / direct_ns if direct_ns else None,
+    }
+
+
+# Сценарии. Каждый возвращает список результатов compare() для своих масштабов.
+
+
+class SizedAdapter(Adapter):
+    """
+    Адаптер с адаптируемыми данными заданного размера.
+    """
+
+    def __init__(self, payload: bytes) -> None:
+        self._payload = payload
+
+    def specific_request(self) -> bytes:
+        return self._payload
+
+
+def bench_adapter(options: argparse.Namespace) -> List[Dict]:
+    results = []
+    for items in (1, 100, 1000):
+        body = "".join(f"<item>{'x' * 32}</item>" for _ in range(items))
+        adapter = SizedAdapter(f"<xml_data>{body}</xml_data>".encode())
+        results.append(compare(
+            "adapter", {"payload_items": items, "payload_bytes": len(adapter.specific_request())},
+            adapter.specific_request, adapter.request, options
+        ))
+    adaptee = Adaptee()
+    results.append(compare("adapter", {"payload": "default"}, adaptee.specific_request, Adapter().request, options))
+    return results
+
+
+def bench_bridge(options: argparse.Namespace) -> List[Dict]:
+    results = []
+    for implementation in (CloudAPIImplementation(), ExternalAPIImplementation()):
+        abstraction = AbstractAPI(api_implementation=implementation)
+        results.append(compare(
+            "bridge", {"implementation": type(implementation).__name__},
+            implementation.login, abstraction.authenticate, options
+        ))
+    return results
+
+
+def build_tree(branching: int, depth: int) -> Tuple[LoadCluster, List[Loader]]:
+    """
+    Строит дерево и возвращает его корень вместе со списком листьев, которые вызываются в прямом замере.
+    """
+
+    root = LoadCluster("cluster-0")
+    level = [root]
+    for current_depth in range(1, depth + 1):
+        next_level = []
+        for parent in level:
+            for index in range(branching):
+                if current_depth == depth:
+                    child = LoadNode(f"node-{current_depth}-{index}")
+                else:
+                    child = LoadCluster(f"cluster-{current_depth}-{index}")
+                parent.add_node(child)
+                next_level.append(child)
+        level = next_level
+    return root, level
+
+
+def bench_composite(options: argparse.Namespace) -> List[Dict]:
+    results = []
+    for branching, depth in ((2, 2), (4, 3), (8, 3), (2, 9)):
+        root, leaves = build_tree(branching, depth)
+
+        def direct(leaves: List[Loader] = leaves) -> str:
+            return "".join([leaf.start_load() for leaf in leaves])
+
+        results.append(compare(
+            "composite", {"branching": branching, "depth": depth, "leaves": len(leaves)},
+            direct, root.start_load, options
+        ))
+    return results
+
+
+def bench_decorator(options: argparse.Namespace) -> List[Dict]:
+    results = []
+    base = BasicSessionDataReporter()
+    for depth in (1, 4, 16, 64):
+        reporter: DataReporter = base
+        for _ in range(depth):
+            reporter = BasicReporterDecorator(reporter)
+        results.append(compare("decorator", {"depth": depth}, base.report_data, reporter.report_data, options))
+    return results
+
+
+def bench_facade(options: argparse.Namespace) -> List[Dict]:
+    db, iot = DbSubsystem(), IoTSubsystem()
+    facade = AWSFacade(db_subsystem=db, iot_subsystem=iot)
+
+    def direct() -> str:
+        return "".join([
+            iot.create_thing(),
+            iot.add_shadow_to_thing(),
+            db.check_charger_in_shadow_table(),
+            db.check_charger_in_cloud_table(),
+            db.check_charger_in_es(),
+        ])
+
+    return [compare("facade", {"steps": 5}, direct, facade.initialize_charger, options)]
+
+
+def bench_flyweight(options: argparse.Namespace) -> List[Dict]:
+    results = []
+    for count in (10, 100, 1000):
+        # Все фабрики разделяют одно хранилище легковесов (оно объявлено на уровне класса). Чтобы не трогать
+        # его напрямую, каждый масштаб работает со своими ключами: прошлые масштабы остаются в словаре,
+        # но на стоимость поиска по ключу это не влияет.
+        states = [{f"brand-{count}-{index}", f"model-{index}", "color"} for index in range(count)]
+        with silenced():
+            factory = FlyweightFactory(states)
+        cursor = iter(range(sys.maxsize))
+
+        def direct(states: List = states) -> Flyweight:
+            return Flyweight(states[next(cursor) % len(states)])
+
+        def wrapped(states: List = states) -> Flyweight:
+            return factory.get_flyweight(states[next(cursor) % len(states)])
+
+        results.append(compare("flyweight", {"flyweights": count}, direct, wrapped, options))
+    return results
+
+
+def bench_proxy(options: argparse.Namespace) -> List[Dict]:
+    real_subject = RealSubject()
+    results = [compare("proxy", {"access_log": False}, real_subject.request, Proxy(real_subject).request, options)]
+    with AccessLogWriter(lambda batch: None, max_queue_size=4096) as access_log:
+        proxy = Proxy(real_subject, principal="bench", access_log=access_log)
+        result = compare("proxy", {"access_log": True}, real_subject.request, proxy.request, options)
+    result["wrapped"]["dropped_records"] = access_log.dropped
+    results.append(result)
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], List[Dict]]] = {
+    "adapter": bench_adapter,
+    "bridge": bench_bridge,
+    "composite": bench_composite,
+    "decorator": bench_decorator,
+    "facade": bench_facade,
+    "flyweight": bench_flyweight,
+    "proxy": bench_proxy,
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure the overhead of structural pattern wrappers.")
+    parser.add_argument("--pattern", action="append", choices=sorted(BENCHMARKS),
+                        help="run only this pattern (may be repeated)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per case")
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimal duration of one repeat, seconds")
+    parser.add_argument("--memory-calls", type=int, default=1000, help="calls traced by tracemalloc per case")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    options = parse_args(argv)
+    results = []
+    for name in options.pattern or sorted(BENCHMARKS):
+        results.extend(BENCHMARKS[name](options))
+    report = {
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "options": {
+            "repeat": options.repeat,
+            "min_time": options.min_time,
+            "memory_calls": options.memory_calls,
+        },
+        "results": results,
+    }
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
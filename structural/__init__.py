@@ -0,0 +1,71 @@
+# Структурные паттерны проектирования.
+#
+# Пакет не импортирует модули с примерами заранее: класс паттерна и его модуль загружаются при первом обращении
+# к атрибуту пакета, поэтому короткоживущие процессы платят только за то, чем действительно пользуются.
+#
+#     from structural import Proxy   # загружается только structural.proxy
+#     import structural
+#     structural.LoadCluster         # загружается structural.composite
+
+import sys
+
+_EXPORTS = {
+    "Target": "adapter",
+    "Adaptee": "adapter",
+    "Adapter": "adapter",
+    "AbstractAPI": "bridge",
+    "APIImplementation": "bridge",
+    "CloudAPIImplementation": "bridge",
+    "ExternalAPIImplementation": "bridge",
+    "Loader": "composite",
+    "LoadNode": "composite",
+    "LoadCluster": "composite",
+    "DataReporter": "decorator",
+    "BasicSessionDataReporter": "decorator",
+    "BasicReporterDecorator": "decorator",
+    "ShadowReporterDecorator": "decorator",
+    "MQTTReporterDecorator": "decorator",
+    "AWSFacade": "facade",
+    "DbSubsystem": "facade",
+    "IoTSubsystem": "facade",
+    "Flyweight": "flyweight",
+    "FlyweightFactory": "flyweight",
+    "Subject": "proxy",
+    "RealSubject": "proxy",
+    "Proxy": "proxy",
+    "AccessLogWriter": "proxy",
+    "HistogramExporter": "instrumentation",
+    "TraceRecorder": "instrumentation",
+    "instrumented": "instrumentation",
+}
+
+_SUBMODULES = {"adapter", "bridge", "composite", "decorator", "facade", "flyweight", "proxy", "instrumentation"}
+
+__all__ = sorted(_EXPORTS)
+
+
+def _load(module_name: str):
+    """
+    Загружает подмодуль через __import__, как это делает инструкция import: такой импорт виден в -X importtime
+    и не требует загрузки importlib.
+    """
+
+    full_name = f"{__name__}.{module_name}"
+    __import__(full_name)
+    return sys.modules[full_name]
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(_load(_EXPORTS[name]), name)
+    elif name in _SUBMODULES:
+        value = _load(name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Последующие обращения берут значение из словаря модуля и не доходят до __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
@@ -7,9 +7,10 @@
 # Методы Адаптера обычно совместимы с интерфейсом одного объекта. Они делегируют вызовы вложенному объекту,
 # превратив перед этим параметры вызова в формат, поддерживаемый вложенным объектом.
 
-import json
-
-import xmltodict
+if __package__:
+    from .instrumentation import instrumented
+else:
+    from instrumentation import instrumented
 
 
 class Target:
@@ -40,7 +41,14 @@ class Adapter(Target, Adaptee):
     В данном случае, конвертирует XML-байтстроку в JSON-объект.
     """
 
+    @instrumented
     def request(self) -> dict:
+        # Зависимости конвертации импортируются при первом вызове: их загрузка заметно дороже импорта самого модуля,
+        # а клиентам, которым нужен только Target, они не нужны.
+        import json
+
+        import xmltodict
+
         return json.loads(json.dumps(xmltodict.parse(self.specific_request())))
 
 
@@ -14,6 +14,11 @@ import string
 import random
 from abc import ABC, abstractmethod
 
+if __package__:
+    from .instrumentation import instrumented
+else:
+    from instrumentation import instrumented
+
 
 class AbstractAPI:
     """
@@ -24,6 +29,7 @@ class AbstractAPI:
     def __init__(self, api_implementation: "APIImplementation"):
         self.implementation = api_implementation
 
+    @instrumented
     def authenticate(self) -> str:
         return self.implementation.login()
 
@@ -10,6 +10,11 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import List
 
+if __package__:
+    from .instrumentation import instrumented
+else:
+    from instrumentation import instrumented
+
 
 class Loader(ABC):
     """
@@ -71,9 +76,11 @@ class LoadNode(Loader):
     своим подкомпонентам.
     """
 
+    @instrumented
     def start_load(self) -> str:
         return f"{self.name} started load.\n"
 
+    @instrumented
     def stop_load(self) -> str:
         return f"{self.name} stopped load.\n"
 
@@ -104,6 +111,7 @@ class LoadCluster(Loader):
     def is_composite(self) -> bool:
         return True
 
+    @instrumented
     def start_load(self) -> str:
         """
         Контейнер выполняет свою основную логику особым образом. Он проходит рекурсивно через всех своих детей,
@@ -116,6 +124,7 @@ class LoadCluster(Loader):
             results.append(child.start_load())
         return f"Cluster {self.name} started load:\n{''.join(results)}"
 
+    @instrumented
     def stop_load(self) -> str:
         results = []
         for child in self._children:
@@ -8,6 +8,11 @@
 
 from abc import ABC, abstractmethod
 
+if __package__:
+    from .instrumentation import instrumented
+else:
+    from instrumentation import instrumented
+
 
 class DataReporter(ABC):
     """
@@ -25,6 +30,7 @@ class BasicSessionDataReporter(DataReporter):
     Может быть несколько вариаций этих классов.
     """
 
+    @instrumented
     def report_data(self) -> str:
         return "I'm reporting basic charging session data to device' shadow"
 
@@ -50,6 +56,7 @@ class BasicReporterDecorator(DataReporter):
 
         return self._reporter
 
+    @instrumented
     def report_data(self) -> str:
         return self._reporter.report_data()
 
@@ -60,6 +67,7 @@ class ShadowReporterDecorator(BasicReporterDecorator):
     некоторым образом.
     """
 
+    @instrumented
     def report_data(self) -> str:
         """
         Декораторы могут вызывать родительскую реализацию операции, вместо вызова обёрнутого объекта напрямую.
@@ -83,6 +91,7 @@ class MQTTReporterDecorator(BasicReporterDecorator):
         self._mqtt_client = "MQTT Client down"
         return "MQTT Client is teared down."
 
+    @instrumented
     def report_data(self) -> str:
         self.setup_mqtt_client()
         reported = f"{self.reporter.report_data()} and sent meter values to MQTT topic"
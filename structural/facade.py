@@ -7,6 +7,12 @@
 # Чаще всего, фасады сами следят за жизненным циклом объектов сложной системы.
 
 
+if __package__:
+    from .instrumentation import instrumented
+else:
+    from instrumentation import instrumented
+
+
 class AWSFacade:
     """
     Класс Фасада предоставляет простой интерфейс для сложной логики одной или нескольких подсистем.
@@ -19,6 +25,7 @@ class AWSFacade:
         self.db_subsystem = db_subsystem or DbSubsystem()
         self.iot_subsystem = iot_subsystem or IoTSubsystem()
 
+    @instrumented
     def initialize_charger(self) -> str:
         results = [
             self.iot_subsystem.create_thing(),
@@ -38,14 +45,17 @@ class DbSubsystem:
     """
 
     @staticmethod
+    @instrumented
     def check_charger_in_shadow_table():
         return "Charger got to shadow table!\n"
 
     @staticmethod
+    @instrumented
     def check_charger_in_cloud_table():
         return "Charger got to cloud table!\n"
 
     @staticmethod
+    @instrumented
     def check_charger_in_es():
         return "Charger got to UI!\n"
 
@@ -56,10 +66,12 @@ class IoTSubsystem:
     """
 
     @staticmethod
+    @instrumented
     def create_thing():
         return "Charger's thing is created!\n"
 
     @staticmethod
+    @instrumented
     def add_shadow_to_thing():
         return "Shadow added to charger's thing!\n"
 
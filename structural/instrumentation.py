@@ -0,0 +1,288 @@
+# Инструментирование структурных обёрток.
+#
+# Обёртки (Заместитель, Декораторы, Фасад, Компоновщик и др.) помечают свои методы декоратором instrumented.
+# Пока не подключён ни один экспортёр, обёрнутый метод лишь проверяет пустой кортеж и сразу вызывает оригинал.
+# Когда экспортёры подключены, на входе и выходе каждого вызова им передаётся Span с именем компонента,
+# операцией, идентичностью объекта и временем выполнения.
+#
+# Модуль импортируют все примеры, а инструментирование по умолчанию выключено, поэтому при загрузке он импортирует
+# только лёгкие модули (без typing и inspect). Остальное экспортёры импортируют сами, когда их создают.
+# Ошибки экспортёров перехватываются и считаются в exporter_errors(): инструментирование никогда не меняет
+# результат или исключение обёрнутого метода.
+#
+# Примеры импортируют этот модуль относительно пакета. Когда пример запущен как скрипт
+# (python structural/<name>.py), он загружается как отдельный модуль верхнего уровня instrumentation
+# со своим списком экспортёров - подключать их в этом случае нужно через него.
+#
+# Пример:
+#     histogram = HistogramExporter()
+#     with instrumentation(histogram, TraceRecorder()):
+#         proxy.request()
+#     print(histogram.snapshot())
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import time
+from collections.abc import Callable, Sequence
+
+
+class Span:
+    """
+    Один вызов инструментированного метода. Родителем является span внешнего инструментированного вызова,
+    поэтому из span'ов складывается дерево вызовов.
+    """
+
+    __slots__ = ("component", "operation", "identity", "parent", "children", "start_ns", "end_ns")
+
+    def __init__(self, component: str, operation: str, identity: str, parent: Span | None) -> None:
+        self.component = component
+        self.operation = operation
+        self.identity = identity
+        self.parent = parent
+        self.children: list[Span] = []
+        self.start_ns = 0
+        self.end_ns = 0
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+    @property
+    def self_ns(self) -> int:
+        """
+        Время, проведённое в самом вызове, без учёта вложенных инструментированных вызовов.
+        """
+
+        return self.duration_ns - sum(child.duration_ns for child in self.children)
+
+    def __repr__(self) -> str:
+        return f"Span({self.component}.{self.operation} [{self.identity}] {self.duration_ns} ns)"
+
+
+class Exporter:
+    """
+    Базовый экспортёр. Подклассы переопределяют нужные им хуки.
+    """
+
+    def on_enter(self, span: Span) -> None:
+        pass
+
+    def on_exit(self, span: Span) -> None:
+        pass
+
+
+class HistogramExporter(Exporter):
+    """
+    Собирает в памяти гистограммы длительностей по паре (компонент, операция).
+    Границы корзин заданы в наносекундах, последняя корзина собирает всё, что длиннее последней границы.
+    Хуки глобальны для процесса, поэтому обновления статистики из разных потоков выполняются под блокировкой.
+    """
+
+    DEFAULT_BOUNDS_NS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000, 1_000_000_000)
+
+    def __init__(self, bounds_ns: Sequence[int] = DEFAULT_BOUNDS_NS) -> None:
+        import threading
+        from bisect import bisect_left
+
+        self._bucket = bisect_left
+        self._lock = threading.Lock()
+        self._bounds_ns = tuple(bounds_ns)
+        self._stats: dict[tuple[str, str], list] = {}
+
+    def on_exit(self, span: Span) -> None:
+        duration = span.duration_ns
+        bucket = self._bucket(self._bounds_ns, duration)
+        with self._lock:
+            stats = self._stats.get((span.component, span.operation))
+            if stats is None:
+                # [count, total_ns, min_ns, max_ns, counts by bucket]
+                stats = self._stats[(span.component, span.operation)] = [
+                    0, 0, duration, duration, [0] * (len(self._bounds_ns) + 1)
+                ]
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = min(stats[2], duration)
+            stats[3] = max(stats[3], duration)
+            stats[4][bucket] += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            items = [(key, stats[:4] + [list(stats[4])]) for key, stats in self._stats.items()]
+        return {
+            f"{component}.{operation}": {
+                "count": count,
+                "total_ns": total,
+                "mean_ns": total / count,
+                "min_ns": min_ns,
+                "max_ns": max_ns,
+                "buckets": dict(zip([f"<={bound}" for bound in self._bounds_ns] + ["+inf"], buckets)),
+            }
+            for (component, operation), (count, total, min_ns, max_ns, buckets) in items
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+class TraceRecorder(Exporter):
+    """
+    Записывает деревья вызовов. Хранятся только последние max_traces корневых span'ов.
+    """
+
+    def __init__(self, max_traces: int = 1000) -> None:
+        from collections import deque
+
+        self.traces = deque(maxlen=max_traces)
+
+    def on_enter(self, span: Span) -> None:
+        if span.parent is None:
+            self.traces.append(span)
+        else:
+            span.parent.children.append(span)
+
+    def render(self, span: Span, indent: int = 0) -> str:
+        lines = [f"{'  ' * indent}{span.component}.{span.operation} [{span.identity}] "
+                 f"{span.duration_ns} ns (self {span.self_ns} ns)"]
+        lines.extend(self.render(child, indent + 1) for child in span.children)
+        return "\n".join(lines)
+
+
+# Флаги объекта кода из модуля inspect. Они продублированы, потому что импорт inspect стоит около 20 мс
+# (больше, чем весь остальной пакет); benchmarks/bench_import.py следит, чтобы он не загружался.
+_CO_VARARGS = 0x04
+_CO_VARKEYWORDS = 0x08
+
+# Кортеж подключённых экспортёров заменяется целиком, поэтому обёрнутые методы читают его без блокировок.
+_exporters: tuple[Exporter, ...] = ()
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+_exporter_errors = 0
+
+
+def add_exporter(exporter: Exporter) -> None:
+    global _exporters
+    _exporters = _exporters + (exporter,)
+
+
+def remove_exporter(exporter: Exporter) -> None:
+    """
+    Отключает последнее подключение экспортёра. Экспортёр, подключённый несколько раз (например, во вложенных
+    блоках instrumentation), остаётся активным, пока не будет отключено каждое подключение.
+    """
+
+    global _exporters
+    for index in range(len(_exporters) - 1, -1, -1):
+        if _exporters[index] is exporter:
+            _exporters = _exporters[:index] + _exporters[index + 1:]
+            return
+
+
+def is_enabled() -> bool:
+    return bool(_exporters)
+
+
+def exporter_errors() -> int:
+    """
+    Число исключений, выброшенных хуками экспортёров и проглоченных инструментированием.
+    """
+
+    return _exporter_errors
+
+
+class instrumentation:
+    """
+    Подключает экспортёры на время блока with.
+    """
+
+    def __init__(self, *exporters: Exporter) -> None:
+        self._exporters = exporters
+
+    def __enter__(self) -> None:
+        for exporter in self._exporters:
+            add_exporter(exporter)
+
+    def __exit__(self, *exc_info) -> None:
+        for exporter in reversed(self._exporters):
+            remove_exporter(exporter)
+
+
+def _identity(instance: object) -> str:
+    name = getattr(instance, "name", None)
+    return name if isinstance(name, str) else f"{type(instance).__name__}@{id(instance):x}"
+
+
+def _notify(exporters: tuple[Exporter, ...], span: Span, entering: bool) -> None:
+    """
+    Вызывает хук каждого экспортёра. Ошибка одного экспортёра не мешает остальным и не доходит до обёрнутого метода.
+    """
+
+    global _exporter_errors
+    for exporter in exporters:
+        try:
+            if entering:
+                exporter.on_enter(span)
+            else:
+                exporter.on_exit(span)
+        except Exception:
+            _exporter_errors += 1
+
+
+def _traced(func: Callable, component: str, operation: str, identity: str, args: tuple, kwargs: dict):
+    exporters = _exporters
+    span = Span(component, operation, identity, _current_span.get())
+    token = _current_span.set(span)
+    try:
+        _notify(exporters, span, entering=True)
+        span.start_ns = time.perf_counter_ns()
+        return func(*args, **kwargs)
+    finally:
+        span.end_ns = time.perf_counter_ns()
+        _current_span.reset(token)
+        _notify(exporters, span, entering=False)
+
+
+def instrumented(func: Callable) -> Callable:
+    """
+    Помечает метод как точку инструментирования. Для методов экземпляра компонентом считается класс объекта,
+    а идентичностью - его имя (атрибут name) или адрес. Для статических методов компонент берётся из имени функции.
+    """
+
+    code = func.__code__
+    bound = code.co_argcount > 0 and code.co_varnames[0] == "self"
+    static_component = func.__qualname__.rpartition(".")[0] or func.__module__
+    operation = func.__name__
+
+    # Большинство методов обёрток не принимают аргументов, кроме self. Для них обёртка без *args/**kwargs
+    # заметно дешевле, что важно при выключенном инструментировании.
+    simple = not code.co_flags & (_CO_VARARGS | _CO_VARKEYWORDS) and not code.co_kwonlyargcount
+
+    if simple and bound and code.co_argcount == 1:
+        @functools.wraps(func)
+        def method_wrapper(self):
+            if not _exporters:
+                return func(self)
+            return _traced(func, type(self).__name__, operation, _identity(self), (self,), {})
+
+        return method_wrapper
+
+    if simple and code.co_argcount == 0:
+        @functools.wraps(func)
+        def static_wrapper():
+            if not _exporters:
+                return func()
+            return _traced(func, static_component, operation, static_component, (), {})
+
+        return static_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _exporters:
+            return func(*args, **kwargs)
+        if bound:
+            instance = args[0]
+            return _traced(func, type(instance).__name__, operation, _identity(instance), args, kwargs)
+        return _traced(func, static_component, operation, static_component, args, kwargs)
+
+    return wrapper
@@ -8,7 +8,16 @@
 # Заместители часто сами следят за жизненным циклом своего реального объекта.
 
 
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+if __package__:
+    from .instrumentation import instrumented
+else:
+    from instrumentation import instrumented
 
 
 class Subject(ABC):
@@ -30,18 +39,161 @@ class RealSubject(Subject):
     данных. Заместитель может решить эти задачи без каких-либо изменений в коде Реального Субъекта.
     """
 
+    @instrumented
     def request(self) -> None:
         print("RealSubject: Handling request.")
 
 
+class AccessLogWriter:
+    """
+    Фоновый писатель журнала доступа. Заместитель лишь кладёт запись в ограниченную очередь и сразу возвращает
+    управление, а отдельный поток собирает записи в пачки и передаёт их обработчику (например, записывает в файл).
+    Если очередь переполнена или писатель уже закрыт, запись отбрасывается, а счётчик dropped увеличивается - журнал
+    не должен тормозить основную работу. Записи из пачек, на которых обработчик упал с ошибкой, считает счётчик failed.
+    """
+
+    _STOP = object()
+
+    def __init__(
+            self,
+            handler: Callable[[List[str]], None],
+            max_queue_size: int = 1024,
+            batch_size: int = 64,
+            flush_interval: float = 0.5
+    ) -> None:
+        self._handler = handler
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._closed = False
+        self._dropped = 0
+        self._failed = 0
+        self._written = 0
+        self._thread = threading.Thread(target=self._run, name="access-log-writer", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def to_file(cls, path: str, **kwargs) -> "AccessLogWriter":
+        """
+        Создаёт писателя, который дописывает пачки записей в файл.
+        """
+
+        def write_batch(batch: List[str]) -> None:
+            with open(path, "a", encoding="utf-8") as log_file:
+                log_file.write("".join(f"{record}\n" for record in batch))
+
+        return cls(write_batch, **kwargs)
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def failed(self) -> int:
+        return self._failed
+
+    @property
+    def written(self) -> int:
+        return self._written
+
+    def log(self, record: str) -> None:
+        # Проверка флага и постановка в очередь выполняются под той же блокировкой, что и закрытие, поэтому запись
+        # не может попасть в очередь после того, как close() её разобрал.
+        with self._lock:
+            if self._closed:
+                self._dropped += 1
+                return
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self._dropped += 1
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Ждёт не дольше timeout секунд, пока фоновый поток запишет накопленные записи, и останавливает его.
+        Записи, которые так и не были переданы обработчику, учитываются в dropped. Повторный вызов ничего не делает.
+        """
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        # Если очередь так и не освободилась, маркер не поместится - поток всё равно остановится, увидев флаг
+        # _closed после того, как разберёт очередь.
+        try:
+            self._queue.put(self._STOP, timeout=self._flush_interval)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        # Если обработчик завис, поток не успел разобрать очередь - оставшиеся записи уже никто не запишет.
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not self._STOP:
+                with self._lock:
+                    self._dropped += 1
+
+    def __enter__(self) -> "AccessLogWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            batch = []
+            try:
+                record = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                stopped = self._closed
+                continue
+            while True:
+                if record is self._STOP:
+                    stopped = True
+                    break
+                batch.append(record)
+                if len(batch) >= self._batch_size:
+                    break
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._handler(batch)
+                except Exception:
+                    self._failed += len(batch)
+                else:
+                    self._written += len(batch)
+
+
 class Proxy(Subject):
     """
     Интерфейс Заместителя идентичен интерфейсу Реального Субъекта.
+    Решения о доступе кэшируются для каждого субъекта доступа (principal) на access_ttl секунд,
+    а журналирование выполняется в фоне через AccessLogWriter.
     """
 
-    def __init__(self, real_subject: RealSubject) -> None:
+    # Кэш объявлен на уровне класса, чтобы заместители одного и того же субъекта доступа разделяли решения.
+    _access_cache: Dict[str, Tuple[bool, float]] = {}
+
+    def __init__(
+            self,
+            real_subject: RealSubject,
+            principal: str = "anonymous",
+            access_log: Optional[AccessLogWriter] = None,
+            access_ttl: float = 1.0
+    ) -> None:
         self._real_subject = real_subject
+        self._principal = principal
+        self._access_log = access_log
+        self._access_ttl = access_ttl
 
+    @instrumented
     def request(self) -> None:
         """
         Наиболее распространёнными областями применения паттерна Заместитель являются ленивая загрузка, кэширование,
@@ -53,14 +205,31 @@ class Proxy(Subject):
             self._real_subject.request()
             self.log_access()
 
-    @staticmethod
-    def check_access() -> bool:
-        print("Proxy: Checking access prior to firing a real request.")
+    @instrumented
+    def check_access(self) -> bool:
+        """
+        Возвращает закэшированное решение, пока не истёк его срок, и только потом обращается к настоящей проверке.
+        """
+
+        now = time.monotonic()
+        cached = self._access_cache.get(self._principal)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        allowed = self.resolve_access(self._principal)
+        self._access_cache[self._principal] = (allowed, now + self._access_ttl)
+        return allowed
+
+    def resolve_access(self, principal: str) -> bool:
+        """
+        Настоящая (потенциально медленная) проверка доступа. Подклассы могут обращаться здесь к внешним системам.
+        """
+
         return True
 
-    @staticmethod
-    def log_access() -> None:
-        print("Proxy: Logging the time of request.", end="")
+    @instrumented
+    def log_access(self) -> None:
+        if self._access_log is not None:
+            self._access_log.log(f"{time.time():.6f} {self._principal} {type(self._real_subject).__name__}.request")
 
 
 def client_code(subject: Subject) -> None:
@@ -82,5 +251,6 @@ if __name__ == "__main__":
     print("")
 
     print("Client: Executing the same client code with a proxy:")
-    proxy = Proxy(real_subject)
-    client_code(proxy)
+    with AccessLogWriter(lambda batch: print(f"Proxy: Logged {len(batch)} request(s).", end="")) as access_log:
+        proxy = Proxy(real_subject, principal="client", access_log=access_log)
+        client_code(proxy)
@@ -0,0 +1,100 @@
+import threading
+import typing
+import unittest
+
+from structural.decorator import BasicSessionDataReporter
+from structural.instrumentation import (
+    Exporter,
+    HistogramExporter,
+    TraceRecorder,
+    exporter_errors,
+    instrumentation,
+    instrumented,
+    is_enabled,
+)
+from structural.proxy import Proxy
+
+
+class FailingExporter(Exporter):
+
+    def __init__(self, on_enter: bool = False, on_exit: bool = False) -> None:
+        self._on_enter = on_enter
+        self._on_exit = on_exit
+
+    def on_enter(self, span) -> None:
+        if self._on_enter:
+            raise RuntimeError("enter")
+
+    def on_exit(self, span) -> None:
+        if self._on_exit:
+            raise RuntimeError("exit")
+
+
+class Worker:
+
+    @instrumented
+    def fail(self) -> None:
+        raise ValueError("own error")
+
+    @instrumented
+    def noop(self) -> None:
+        pass
+
+
+class InstrumentationTest(unittest.TestCase):
+
+    def test_exporter_errors_do_not_change_the_wrapped_call(self):
+        histogram = HistogramExporter()
+        errors_before = exporter_errors()
+        with instrumentation(FailingExporter(on_enter=True), FailingExporter(on_exit=True), histogram):
+            result = BasicSessionDataReporter().report_data()
+
+        self.assertEqual(result, BasicSessionDataReporter.report_data.__wrapped__(BasicSessionDataReporter()))
+        self.assertEqual(exporter_errors() - errors_before, 2)
+        self.assertEqual(histogram.snapshot()["BasicSessionDataReporter.report_data"]["count"], 1)
+
+    def test_wrapped_exception_wins_over_exporter_errors(self):
+        with instrumentation(FailingExporter(on_exit=True)):
+            with self.assertRaisesRegex(ValueError, "own error"):
+                Worker().fail()
+
+    def test_nested_blocks_keep_the_outer_exporter(self):
+        histogram = HistogramExporter()
+        with instrumentation(histogram):
+            with instrumentation(histogram):
+                pass
+            self.assertTrue(is_enabled())
+        self.assertFalse(is_enabled())
+
+    def test_trace_tree_follows_calls(self):
+        recorder = TraceRecorder()
+        with instrumentation(recorder):
+            Worker().noop()
+            Worker().noop()
+
+        self.assertEqual([span.operation for span in recorder.traces], ["noop", "noop"])
+        self.assertTrue(all(span.parent is None for span in recorder.traces))
+
+    def test_histogram_counts_calls_from_several_threads(self):
+        histogram = HistogramExporter()
+        worker = Worker()
+
+        def run() -> None:
+            for _ in range(2000):
+                worker.noop()
+
+        with instrumentation(histogram):
+            threads = [threading.Thread(target=run) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(histogram.snapshot()["Worker.noop"]["count"], 8000)
+
+    def test_wrapped_methods_keep_annotations(self):
+        self.assertEqual(typing.get_type_hints(Proxy.check_access), {"return": bool})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import threading
+import time
+import unittest
+
+from structural.proxy import AccessLogWriter, Proxy, RealSubject
+
+
+class SilentSubject(RealSubject):
+
+    def request(self) -> None:
+        pass
+
+
+class AccessLogWriterTest(unittest.TestCase):
+
+    def test_records_are_written_in_batches(self):
+        batches = []
+        writer = AccessLogWriter(batches.append, batch_size=2)
+        for index in range(5):
+            writer.log(f"record {index}")
+        writer.close()
+
+        self.assertEqual([record for batch in batches for record in batch], [f"record {i}" for i in range(5)])
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+        self.assertEqual((writer.written, writer.dropped, writer.failed), (5, 0, 0))
+
+    def test_full_queue_drops_records(self):
+        release = threading.Event()
+        writer = AccessLogWriter(lambda batch: release.wait(), max_queue_size=2, batch_size=1)
+        writer.log("taken by the writer thread")
+        time.sleep(0.1)
+        for index in range(5):
+            writer.log(f"record {index}")
+        release.set()
+        writer.close()
+
+        self.assertEqual(writer.dropped, 3)
+        self.assertEqual(writer.written, 3)
+
+    def test_handler_errors_are_counted_and_do_not_stop_the_writer(self):
+        calls = []
+
+        def handler(batch):
+            calls.append(batch)
+            if len(calls) == 1:
+                raise OSError("disk is full")
+
+        writer = AccessLogWriter(handler, batch_size=1)
+        writer.log("lost")
+        time.sleep(0.1)
+        writer.log("written")
+        writer.close()
+
+        self.assertEqual((writer.failed, writer.written, writer.dropped), (1, 1, 0))
+
+    def test_close_is_idempotent_and_later_records_are_dropped(self):
+        writer = AccessLogWriter(lambda batch: None, max_queue_size=2)
+        writer.close()
+        for _ in range(3):
+            writer.log("after close")
+        writer.close()
+
+        self.assertEqual(writer.dropped, 3)
+
+    def test_close_does_not_wait_for_a_blocked_handler(self):
+        release = threading.Event()
+        writer = AccessLogWriter(lambda batch: release.wait(), max_queue_size=4, batch_size=1)
+        writer.log("blocks the handler")
+        time.sleep(0.1)
+        writer.log("never written")
+
+        started = time.monotonic()
+        writer.close(timeout=0.2)
+        elapsed = time.monotonic() - started
+        release.set()
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(writer.dropped, 1)
+
+
+class ProxyAccessCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        Proxy._access_cache.clear()
+
+    def test_decision_is_shared_between_proxies_of_one_principal(self):
+        checks = []
+
+        class CountingProxy(Proxy):
+            def resolve_access(self, principal: str) -> bool:
+                checks.append(principal)
+                return True
+
+        for _ in range(3):
+            CountingProxy(SilentSubject(), principal="alice", access_ttl=60).request()
+        CountingProxy(SilentSubject(), principal="bob", access_ttl=60).request()
+
+        self.assertEqual(checks, ["alice", "bob"])
+
+    def test_decision_expires_after_ttl(self):
+        checks = []
+
+        class CountingProxy(Proxy):
+            def resolve_access(self, principal: str) -> bool:
+                checks.append(principal)
+                return False
+
+        proxy = CountingProxy(SilentSubject(), principal="carol", access_ttl=0.05)
+        self.assertFalse(proxy.check_access())
+        self.assertFalse(proxy.check_access())
+        time.sleep(0.1)
+        self.assertFalse(proxy.check_access())
+
+        self.assertEqual(checks, ["carol", "carol"])
+
+
+if __name__ == "__main__":
+    unittest.main()